@@ -1,4 +1,5 @@
 import logging
+from bisect import bisect_right
 from collections import defaultdict
 from dateutil.rrule import rrule, MONTHLY, WEEKLY, YEARLY, DAILY
 import datetime
@@ -17,7 +18,8 @@ class Aggregator:
         """
         :param project: str. Name of the project
         :param io_dir: Path. Path to the project's output directory
-        :param data_to_aggregate: list of dictionaries. The data that will be aggregated
+        :param data_to_aggregate: iterable of dictionaries. The data that will be aggregated. If it is a generator
+            (e.g. streamed from a file), then it can only be aggregated with a single call to aggregate_chunks
         """
         self.project = project
         self.data_to_aggregate = data_to_aggregate
@@ -40,6 +42,25 @@ class Aggregator:
 
         return blocks_per_entity
 
+    def aggregate_chunks(self, timeframe_chunks):
+        """
+        Processes the mapped data to aggregate the results for each of the given chunks of time, going over the data
+        only once
+        :param timeframe_chunks: list of tuples of (start_date, end_date) where each date is a datetime.date object.
+            The chunks must be sorted and not overlap with each other (as is the case for the output of
+            divide_timeframe)
+        :returns: a dictionary with the entities and lists of the number of blocks they have produced in each chunk
+        """
+        chunk_starts = [chunk_start for chunk_start, _ in timeframe_chunks]
+        blocks_per_entity = defaultdict(lambda: [0] * len(timeframe_chunks))
+        for block in self.data_to_aggregate:
+            block_date = hlp.get_timeframe_beginning(block['timestamp'][:10])
+            i = bisect_right(chunk_starts, block_date) - 1  # the last chunk that starts before or on block_date
+            if i >= 0 and block_date <= timeframe_chunks[i][1]:
+                blocks_per_entity[block['creator']][i] += 1
+
+        return blocks_per_entity
+
 
 def divide_timeframe(timeframe, granularity):
     """
@@ -87,14 +108,14 @@ def aggregate(project, output_dir, timeframe, aggregate_by, force_aggregate, map
         year, all
     :param force_aggregate: bool. If True, then the aggregation will be performed, regardless of whether aggregated
         data for the project and specified granularity already exist
-    :param mapped_data: list of dictionaries (the data that will be aggregated). If None, then the data will be read
-    from the project's output directory
+    :param mapped_data: list of dictionaries (the data that will be aggregated). If None, then the data will be
+    streamed from the project's output directory
     :returns: a list of strings that correspond to the time chunks of the aggregation or None if no aggregation took
     place (the corresponding output file already existed and force_aggregate was set to False)
     """
     project_io_dir = output_dir / project
     if mapped_data is None:
-        mapped_data = hlp.read_mapped_project_data(project_io_dir)
+        mapped_data = hlp.iter_mapped_project_data(project_io_dir)
     aggregator = Aggregator(project, project_io_dir, mapped_data)
 
     filename = hlp.get_blocks_per_entity_filename(aggregate_by=aggregate_by, timeframe=timeframe)
@@ -103,12 +124,7 @@ def aggregate(project, output_dir, timeframe, aggregate_by, force_aggregate, map
     if not output_file.is_file() or force_aggregate:
         logging.info(f'Aggregating {project} data..')
         timeframe_chunks = divide_timeframe(timeframe=timeframe, granularity=aggregate_by)
-        blocks_per_entity = defaultdict(lambda: [0] * len(timeframe_chunks))
-        for i, chunk in enumerate(timeframe_chunks):
-            chunk_start, chunk_end = chunk
-            chunk_blocks_per_entity = aggregator.aggregate(chunk_start, chunk_end)
-            for entity, blocks in chunk_blocks_per_entity.items():
-                blocks_per_entity[entity][i] = blocks
+        blocks_per_entity = aggregator.aggregate_chunks(timeframe_chunks)
 
         timeframe_chunks = hlp.format_time_chunks(time_chunks=timeframe_chunks, granularity=aggregate_by)
         hlp.write_blocks_per_entity_to_file(
@@ -20,24 +20,29 @@ def analyze(projects, aggregated_data_filename, output_dir):
     metrics = hlp.get_metrics_config()
 
     csv_contents = {}
-    for metric, args_dict in metrics.items():
+    for metric in metrics:
         # Each metric list is of the form [['<timeframe>', '<comma-separated values for different projects']].
         # The special entry ['timeframe', '<comma-separated names of projects>'] is for the csv header
         csv_contents[metric] = [['timeframe'] + projects]
+    metric_funcs = {metric: eval(f'compute_{metric}') for metric in metrics}
 
-        for column_index, project in enumerate(projects):
-            aggregated_data_dir = output_dir / project / 'blocks_per_entity'
-            time_chunks, blocks_per_entity = hlp.get_blocks_per_entity_from_file(aggregated_data_dir / aggregated_data_filename)
+    for column_index, project in enumerate(projects):
+        aggregated_data_dir = output_dir / project / 'blocks_per_entity'
+        time_chunks, entities, blocks = hlp.get_blocks_per_entity_matrix_from_file(
+            aggregated_data_dir / aggregated_data_filename)
 
-            for row_index, time_chunk in enumerate(time_chunks):
+        for row_index, time_chunk in enumerate(time_chunks):
+            # the distribution of blocks of each time chunk is built once and shared by all metrics
+            time_chunk_blocks_per_entity = dict(zip(entities, blocks[:, row_index].tolist()))
+            for metric, args_dict in metrics.items():
                 if column_index == 0:
                     csv_contents[metric].append([time_chunk])
-                time_chunk_blocks_per_entity = {entity: blocks[row_index] for entity, blocks in blocks_per_entity.items()}
-                func = eval(f'compute_{metric}')
+                func = metric_funcs[metric]
                 result = func(time_chunk_blocks_per_entity, **args_dict) if args_dict else func(
                     time_chunk_blocks_per_entity)
                 csv_contents[metric][row_index + 1].append(result)
 
+    for metric in metrics:
         with open(output_dir / f'{metric}.csv', 'w') as f:
             csv_writer = csv.writer(f)
             csv_writer.writerows(csv_contents[metric])
@@ -3,18 +3,40 @@ Module with helper functions
 """
 import csv
 import pathlib
-import json
 import datetime
-import calendar
 import argparse
+from bisect import bisect_right
 from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from types import MappingProxyType
 
-from yaml import safe_load
+import numpy as np
+import pandas as pd
+from yaml import load as yaml_load
+
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:  # PyYAML was built without libyaml, so fall back to the (slower) pure python loader
+    from yaml import SafeLoader as YamlSafeLoader
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional, so fall back to the (slower) parser of the standard library
+    from json import loads as json_loads
+
+try:
+    import ijson
+except ImportError:  # ijson is optional, so fall back to reading mapped data files in one go
+    ijson = None
 
 ROOT_DIR = pathlib.Path(__file__).resolve().parent.parent
 RAW_DATA_DIR = ROOT_DIR / 'raw_block_data'
 OUTPUT_DIR = ROOT_DIR / 'output'
 MAPPING_INFO_DIR = ROOT_DIR / 'mapping_information'
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)  # in non-leap years
+GRANULARITY_ADVERBS = {'day': 'daily', 'week': 'weekly', 'month': 'monthly', 'year': 'yearly'}
+TIME_CHUNK_FORMATS = {'month': '%b-%Y', 'year': '%Y'}  # formats of time chunks that are labeled by their start date
 
 
 def valid_date(date_string):
@@ -33,26 +55,54 @@ def valid_date(date_string):
     return date_string
 
 
+def get_days_in_month(year, month):
+    """
+    Determines the number of days of a given month
+    :param year: int that corresponds to the year under consideration
+    :param month: int that corresponds to the month under consideration (1-12)
+    :returns: the number of days of the month, taking into account leap years
+    :raises ValueError: if the month is not valid
+    """
+    if not 1 <= month <= 12:
+        raise ValueError(f'Invalid month: {month}')
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return 29
+    return DAYS_IN_MONTH[month - 1]
+
+
+@lru_cache(maxsize=None)
 def get_timeframe_beginning(timeframe):
     """
     Determines the first day of a given timeframe
+    Caches the result for quick access when the function is called again with the same timeframe.
     :param timeframe: a string representation of the timeframe in YYYY-MM-DD, YYYY-MM or YYYY format
     :returns: a date object corresponding to the first day of the timeframe
     """
-    return datetime.date.fromisoformat(timeframe.ljust(10, 'x').replace('xxx', '-01'))
+    timeframe_length = len(timeframe)
+    if timeframe_length == 10:
+        return datetime.date.fromisoformat(timeframe)
+    if timeframe_length == 7:
+        return datetime.date.fromisoformat(timeframe + '-01')
+    if timeframe_length == 4:
+        return datetime.date.fromisoformat(timeframe + '-01-01')
+    raise ValueError(f'Invalid timeframe: {timeframe}')
 
 
+@lru_cache(maxsize=None)
 def get_timeframe_end(timeframe):
     """
     Determines the last day of a given timeframe
+    Caches the result for quick access when the function is called again with the same timeframe.
     :param timeframe: a string representation of the timeframe in YYYY-MM-DD, YYYY-MM or YYYY format
     :returns: a date object corresponding to the last day of the timeframe
     """
-    timeframe_with_month = timeframe.ljust(7, 'x').replace('xxx', '-12')
-    year, month = [int(i) for i in timeframe_with_month.split('-')][:2]
-    days_in_month = calendar.monthrange(year, month)[1]
-    timeframe_with_day = timeframe_with_month.ljust(10, 'x').replace('xxx', f'-{days_in_month}')
-    return datetime.date.fromisoformat(timeframe_with_day)
+    first_day = get_timeframe_beginning(timeframe)
+    timeframe_length = len(timeframe)
+    if timeframe_length == 4:
+        return first_day.replace(month=12, day=31)
+    if timeframe_length == 7:
+        return first_day.replace(day=get_days_in_month(first_day.year, first_day.month))
+    return first_day
 
 
 def get_time_period(frm, to):
@@ -68,91 +118,160 @@ def get_time_period(frm, to):
     return start, end
 
 
+def read_json(filepath):
+    """
+    Reads and parses a json file, using orjson if it is installed
+    :param filepath: the path to the json file
+    :returns: the parsed contents of the file
+    """
+    with open(filepath, 'rb') as f:
+        return json_loads(f.read())
+
+
+@lru_cache(maxsize=None)
 def get_pool_identifiers(project_name):
     """
     Retrieves identifiers (tags, etc) about the pools of a project.
+    Caches the result, so the relevant file is only read once per project.
     :param project_name: string that corresponds to the project under consideration
-    :returns: a dictionary where each key corresponds to an identifier (tag, ticker, etc) and each value is
+    :returns: a read-only dictionary where each key corresponds to an identifier (tag, ticker, etc) and each value is
     another dictionary with information about the entity behind the identifier (name of the pool, website, etc),
     or an empty dictionary if no information is available for the project (the relevant file does not exist)
     """
     try:
-        with open(MAPPING_INFO_DIR / f'identifiers/{project_name}.json') as f:
-            identifiers = json.load(f)
+        identifiers = read_json(MAPPING_INFO_DIR / f'identifiers/{project_name}.json')
     except FileNotFoundError:
-        return dict()
+        identifiers = dict()
+
+    return MappingProxyType(identifiers)
 
-    return identifiers
+
+@lru_cache(maxsize=None)
+def _load_cluster_data(project_name):
+    """
+    Reads the clusters of pools of a project. Caches the result, so the relevant file is only read once per project.
+    :param project_name: string that corresponds to the project under consideration
+    :returns: a read-only dictionary with cluster names as keys and lists of pool information as values, or an empty
+    dictionary if no clusters are known for the project (the relevant file does not exist)
+    """
+    try:
+        cluster_data = read_json(MAPPING_INFO_DIR / f'clusters/{project_name}.json')
+    except FileNotFoundError:
+        cluster_data = dict()
+
+    return MappingProxyType(cluster_data)
+
+
+@lru_cache(maxsize=1)
+def _load_legal_data():
+    """
+    Reads the legal links between pools, which are common to all projects. Caches the result, so the relevant file is
+    only read once.
+    :returns: a read-only dictionary with legal entities as keys and lists of pool information as values
+    """
+    legal_data = read_json(MAPPING_INFO_DIR / 'legal_links.json')
+
+    return MappingProxyType(legal_data)
+
+
+@lru_cache(maxsize=None)
+def _get_link_periods(project_name):
+    """
+    Gathers the links between the pools of a project (from both the project's clusters and the legal links) along
+    with the periods during which they hold, sorted by the beginning of each period. Caches the result, so that the
+    links are only gathered once per project.
+    :param project_name: string that corresponds to the project under consideration
+    :returns: a tuple of length 2 where the first item is a list with the first day of each link's period (sorted)
+    and the second item is a list of tuples (order, last day, pool name, cluster name) in the same order, where order
+    is the position of the link in the files
+    """
+    links = []
+    for data in [_load_cluster_data(project_name), _load_legal_data()]:
+        for cluster_name, pools in data.items():
+            for pool_info in pools:
+                link_start, link_end = get_time_period(pool_info['from'], pool_info['to'])
+                links.append((link_start, (len(links), link_end, pool_info['name'], cluster_name)))
+    links.sort(key=itemgetter(0))
+    return [link_start for link_start, _ in links], [link for _, link in links]
 
 
-@lru_cache(maxsize=2)
 def get_pool_links(project_name, timeframe):
     """
     Retrieves data regarding the links between the pools of a project.
-    Caches the result for quick access when the function is called again with the same arguments.
+    The timeframe is first converted to the period that it spans, so that the cached result of
+    _get_pool_links_for_period is reused for all timeframe strings that correspond to the same period.
     :param project_name: string that corresponds to the project under consideration
     :param timeframe: string that corresponds to the timeframe under consideration (in YYYY-MM-DD, YYYY-MM or YYYY
     format)
-    :returns: a dictionary that reveals the ownership of pools
+    :returns: a read-only dictionary that reveals the ownership of pools
     """
-    start = get_timeframe_beginning(timeframe)
-    end = get_timeframe_end(timeframe)
+    return _get_pool_links_for_period(project_name, get_timeframe_beginning(timeframe), get_timeframe_end(timeframe))
 
-    pool_links = {}
 
-    try:
-        with open(MAPPING_INFO_DIR / f'clusters/{project_name}.json') as f:
-            cluster_data = json.load(f)
-    except FileNotFoundError:
-        cluster_data = {}
+@lru_cache(maxsize=1024)
+def _get_pool_links_for_period(project_name, start, end):
+    """
+    Retrieves data regarding the links between the pools of a project that hold at any point during a period.
+    Caches the result for quick access when the function is called again with the same arguments.
+    :param project_name: string that corresponds to the project under consideration
+    :param start: datetime.date object that corresponds to the first day of the period
+    :param end: datetime.date object that corresponds to the last day of the period
+    :returns: a read-only dictionary that reveals the ownership of pools
+    """
+    link_starts, links = _get_link_periods(project_name)
 
-    with open(MAPPING_INFO_DIR / 'legal_links.json') as f:
-        legal_data = json.load(f)
+    pool_links, link_orders = {}, {}
+    # Only the links that start before the end of the period can overlap with it
+    for order, link_end, pool_name, cluster_name in islice(links, bisect_right(link_starts, end)):
+        # If a pool is linked to different clusters, the link that appears last in the files takes precedence
+        if start <= link_end and order > link_orders.get(pool_name, -1):
+            link_orders[pool_name] = order
+            pool_links[pool_name] = cluster_name
 
-    for data in [cluster_data, legal_data]:
-        for cluster_name, pools in data.items():
-            for pool_info in pools:
-                link_start, link_end = get_time_period(pool_info['from'], pool_info['to'])
+    for pool in pool_links:  # resolve chain links
+        _find_link_root(pool_links, pool)
 
-                check_list = [  # Check if two periods overlap at any point
-                    start <= link_start <= end,
-                    start <= link_end <= end,
-                    link_start <= start <= link_end,
-                    link_start <= end <= link_end
-                ]
-                if any(check_list):
-                    pool_links[pool_info['name']] = cluster_name
-
-    for parent, child in pool_links.items():  # resolve chain links
-        while child in pool_links.keys():
-            next_child = pool_links[child]
-            if next_child == child:
-                # Cluster's name is the same as the primary pool's name
-                break
-            elif next_child == parent:
-                raise AssertionError(f'Circular dependency: {parent}, {child}')
-            else:
-                child = next_child
-        pool_links[parent] = child
+    return MappingProxyType(pool_links)
 
-    return pool_links
+
+def _find_link_root(pool_links, pool):
+    """
+    Follows the chain of links that starts from a pool up to the entity that owns it. All pools along the chain are
+    then linked directly to that entity (path compression), so that chains are only traversed once.
+    :param pool_links: a dictionary that reveals the ownership of pools, which is updated in place
+    :param pool: string that corresponds to the pool under consideration
+    :returns: the name of the entity at the end of the chain
+    :raises AssertionError: if the chain of links is circular
+    """
+    chain = set()
+    root = pool
+    # Cluster's name may be the same as the primary pool's name, in which case the pool is linked to itself
+    while root in pool_links and pool_links[root] != root:
+        if root in chain:
+            raise AssertionError(f'Circular dependency: {pool}, {root}')
+        chain.add(root)
+        root = pool_links[root]
+    for linked_pool in chain:
+        pool_links[linked_pool] = root
+    return root
 
 
+@lru_cache(maxsize=None)
 def get_known_addresses(project_name):
     """
     Retrieves the addresses associated with pools of a certain project over a given timeframe
+    Caches the result, so the relevant file is only read once per project.
     :param project_name: string that corresponds to the project under consideration
-    :returns: a dictionary with known addresses and the names of the pools that own them (given that the timeframe of
+    :returns: a read-only dictionary with known addresses and the names of the pools that own them (given that the timeframe of
     the ownership overlaps with the timeframe under consideration), or an empty dictionary if no addresses are known
     for the project (no such file exists)
     """
     try:
-        with open(MAPPING_INFO_DIR / f'addresses/{project_name}.json') as f:
-            address_data = json.load(f)
+        address_data = read_json(MAPPING_INFO_DIR / f'addresses/{project_name}.json')
     except FileNotFoundError:
-        return dict()
+        address_data = dict()
 
-    return {address: addr_info['name'] for address, addr_info in address_data.items()}
+    return MappingProxyType({address: addr_info['name'] for address, addr_info in address_data.items()})
 
 
 def write_blocks_per_entity_to_file(output_dir, blocks_per_entity, time_chunks, filename):
@@ -165,10 +284,28 @@ def write_blocks_per_entity_to_file(output_dir, blocks_per_entity, time_chunks,
     :param time_chunks: a list of strings corresponding to the chunks of time that were analyzed
     :param filename: the name to be given to the produced file.
     """
-    with open(output_dir / filename, 'w', newline='') as f:
+    with open(output_dir / filename, 'w', newline='', buffering=1 << 20) as f:
         csv_writer = csv.writer(f)
-        csv_writer.writerow(['Entity \\ Time period'] + time_chunks)  # write header
-        csv_writer.writerows([[entity] + blocks for entity, blocks in blocks_per_entity.items()])
+        csv_writer.writerow(['Entity \\ Time period', *time_chunks])  # write header
+        csv_writer.writerows((entity, *blocks) for entity, blocks in blocks_per_entity.items())
+
+
+def get_blocks_per_entity_matrix_from_file(filepath):
+    """
+    Retrieves information about the number of blocks that each entity produced over some timeframe for some project,
+    in the form of a matrix where each row corresponds to an entity and each column to a time chunk.
+    :param filepath: the path to the file with the relevant information. It can be either an absolute or a relative
+    path in either a pathlib.PosixPath object or a string.
+    :returns: a tuple of length 3 where the first item is a list of time chunks (strings), the second item is a list
+    of entities (strings) and the third item is a numpy array of shape (number of entities, number of time chunks)
+    with the number of blocks that each entity produced during each time chunk
+    """
+    # the entities' column is read as is, so that names like "None" or "NA" are not treated as missing values
+    df = pd.read_csv(filepath, converters={0: str}, keep_default_na=False)
+    time_chunks = df.columns[1:].tolist()
+    entities = df.iloc[:, 0].tolist()
+    blocks = df.iloc[:, 1:].to_numpy(dtype=np.int64)
+    return time_chunks, entities, blocks
 
 
 def get_blocks_per_entity_from_file(filepath):
@@ -179,49 +316,62 @@ def get_blocks_per_entity_from_file(filepath):
     :returns: a tuple of length 2 where the first item is a list of time chunks (strings) and the second item is a
     dictionary with entities (keys) and a list of the number of blocks they produced during each time chunk (values)
     """
-    with open(filepath, newline='') as f:
-        csv_reader = csv.reader(f)
-        header = next(csv_reader, None)
-        time_chunks = header[1:]
-        blocks_per_entity = {line[0]: [int(nblocks) for nblocks in line[1:]] for line in csv_reader}
+    time_chunks, entities, blocks = get_blocks_per_entity_matrix_from_file(filepath)
+    blocks_per_entity = {entity: blocks[i].tolist() for i, entity in enumerate(entities)}
     return time_chunks, blocks_per_entity
 
 
+@lru_cache(maxsize=None)
 def get_special_addresses(project_name):
     """
     Retrieves special addresses of a project, such as treasury addresses, protocol related smart contracts, etc.
+    Caches the result, so the relevant file is only read once per project.
     :param project_name: string that corresponds to the project under consideration
-    :returns: a set of addresses or an empty set if no special addresses are found for the project
+    :returns: a frozenset of addresses or an empty frozenset if no special addresses are found for the project
     """
-    with open(MAPPING_INFO_DIR / 'special_addresses.json') as f:
-        special_address_data = json.load(f)
+    special_address_data = read_json(MAPPING_INFO_DIR / 'special_addresses.json')
 
     try:
         special_addresses = special_address_data[project_name]
     except KeyError:
-        return set()
+        return frozenset()
 
-    return set([addr['address'] for addr in special_addresses])
+    return frozenset([addr['address'] for addr in special_addresses])
 
 
+def clear_mapping_info_caches():
+    """
+    Clears the cached mapping information (identifiers, addresses, clusters, legal links, special addresses and the
+    pool links derived from them), along with the cached timeframe boundaries, so that the relevant files are read
+    again the next time they are needed. Useful when the mapping information files change during execution.
+    """
+    for cached_func in [get_timeframe_beginning, get_timeframe_end, get_pool_identifiers, _load_cluster_data,
+                        _load_legal_data, _get_link_periods, _get_pool_links_for_period, get_known_addresses,
+                        get_special_addresses]:
+        cached_func.cache_clear()
+
+
+@lru_cache(maxsize=1)
 def get_config_data():
     """
     Reads the configuration data of the project. This data is read from a file named "confing.yaml" located at the
-    root directory of the project.
-    :returns: a dictionary of configuration keys and values
+    root directory of the project. Caches the result, so the file is only read once.
+    :returns: a read-only dictionary of configuration keys and values
     """
     with open(ROOT_DIR / "config.yaml") as f:
-        config = safe_load(f)
-    return config
+        config = yaml_load(f, Loader=YamlSafeLoader)
+    return MappingProxyType(config)
 
 
+@lru_cache(maxsize=1)
 def get_metrics_config():
     """
     Reads data about the metrics that will be used from the project's config file. All metrics that are mentioned in
     the file (not in comments) will be used at the "analyze" and "plot" stages. If a metric is parameterized, then the
     values of its parameters are also given in this file. To add a new metric, one can add a new entry in the file, and
     to disable a metric it suffices to comment out the relevant line(s).
-    :returns: a dictionary where the keys correspond to metric names and the values to their configurations
+    Caches the result, so the checks are only performed once.
+    :returns: a read-only dictionary where the keys correspond to metric names and the values to their configurations
     (dictionary of parameter - value pairs for each parameter that the metric takes)
     :raises AssertionError if the file defines different parameter values for metrics that are supposed to be
     consistent (e.g. entropy and entropy percentage)
@@ -239,20 +389,21 @@ def get_metrics_config():
                 assert metrics[metric] == params, "Metrics that belong in the same family (e.g. entropy and entropy " \
                                                   "percentage) must use the same parameter values. " \
                                                   "Please update your config.yaml file accordingly."
-    return metrics
+    return MappingProxyType(metrics)
 
 
 def get_default_ledgers():
     """
     Retrieves data regarding the default ledgers to use
     :returns: a list of strings that correspond to the ledgers that will be used (unless overriden by the relevant cmd
-    arg)
+    arg). The list is a new copy on every call, so that changes to it do not affect the cached configuration data
     """
     config = get_config_data()
-    ledgers = config['default_ledgers']
+    ledgers = list(config['default_ledgers'])
     return ledgers
 
 
+@lru_cache(maxsize=1)
 def get_default_start_end_dates():
     """
     Retrieves the start and end dates for which to analyze data
@@ -268,11 +419,24 @@ def read_mapped_project_data(project_dir):
     :param project_dir: pathlib.PosixPath object of the output directory corresponding to the project
     :returns: a dictionary with the mapped data
     """
-    with open(project_dir / 'mapped_data.json') as f:
-        data = json.load(f)
+    data = read_json(project_dir / 'mapped_data.json')
     return data
 
 
+def iter_mapped_project_data(project_dir):
+    """
+    Iterates over the mapped data from a project's output directory one block at a time. If ijson is installed, the
+    file is parsed incrementally, so that it is never loaded into memory as a whole.
+    :param project_dir: pathlib.PosixPath object of the output directory corresponding to the project
+    :returns: a generator of dictionaries, each with the mapped data of one block
+    """
+    if ijson is None:
+        yield from read_mapped_project_data(project_dir)
+        return
+    with open(project_dir / 'mapped_data.json', 'rb') as f:
+        yield from ijson.items(f, 'item')
+
+
 def format_time_chunks(time_chunks, granularity):
     """
     Formats the time chunks into strings that can be used in the output files or as labels in plots
@@ -281,16 +445,13 @@ def format_time_chunks(time_chunks, granularity):
     :returns: a list of strings that correspond to the time chunks in a format that can be used in the output files
     """
     if granularity == 'day':
-        timeframe_chunks = [f'{chunk[0].strftime("%Y-%m-%d")}' for chunk in time_chunks]
-    elif granularity == 'month':
-        timeframe_chunks = [f'{chunk[0].strftime("%b-%Y")}' for chunk in time_chunks]
-    elif granularity == 'year':
-        timeframe_chunks = [f'{chunk[0].strftime("%Y")}' for chunk in time_chunks]
-    else:
-        # in the cases of 'week' and 'all' granularities, we use the whole start_date and end_date
-        timeframe_chunks = [f'{chunk[0].strftime("%Y-%m-%d")} to {chunk[1].strftime("%Y-%m-%d")}' for chunk in
-                            time_chunks]
-    return timeframe_chunks
+        # isoformat produces the same output as strftime("%Y-%m-%d"), only faster
+        return [chunk[0].isoformat() for chunk in time_chunks]
+    date_format = TIME_CHUNK_FORMATS.get(granularity)
+    if date_format is not None:
+        return [chunk[0].strftime(date_format) for chunk in time_chunks]
+    # in the cases of 'week' and 'all' granularities, we use the whole start_date and end_date
+    return [f'{chunk[0].isoformat()} to {chunk[1].isoformat()}' for chunk in time_chunks]
 
 
 def get_granularity_from_aggregate_by(aggregate_by):
@@ -299,16 +460,7 @@ def get_granularity_from_aggregate_by(aggregate_by):
     :param aggregate_by: str that can be one of day, week, month, year, all
     :returns: str that is the corresponding adverb of aggregate_by
     """
-    if aggregate_by == 'day':
-        return 'daily'
-    elif aggregate_by == 'week':
-        return 'weekly'
-    elif aggregate_by == 'month':
-        return 'monthly'
-    elif aggregate_by == 'year':
-        return 'yearly'
-    else:
-        return 'all'
+    return GRANULARITY_ADVERBS.get(aggregate_by, 'all')
 
 
 def get_blocks_per_entity_filename(aggregate_by, timeframe):
@@ -1,3 +1,4 @@
+from collections import defaultdict
 from consensus_decentralization.mappings.default_mapping import DefaultMapping
 import consensus_decentralization.helper as hlp
 
@@ -10,20 +11,24 @@ class CardanoMapping(DefaultMapping):
     def __init__(self, project_name, output_dir, data_to_map):
         super().__init__(project_name, output_dir, data_to_map)
 
-    def map_from_known_identifiers(self, block):
+    def map_from_known_identifiers(self, block, pool_links=None):
         """
         Maps one block to its block producer (pool) based on known identifiers. Overrides the map_from_known_identifiers
         of the DefaultMapping class to tailor the process to Cardano
         :param block: dictionary with block information (block number, timestamp, identifiers, etc)
+        :param pool_links: dictionary with the pool links that hold on the day the block was produced. If None, then
+        the pool links are retrieved based on the block's timestamp
         :returns: the name of the pool that produced the block, if it was successfully mapped, otherwise None
         """
         block_identifier = block['identifiers']
-        day = block['timestamp'][:10]
-        pool_links = hlp.get_pool_links(self.project_name, day)
-        if block_identifier in pool_links.keys():
-            return pool_links[block_identifier]
-        if block_identifier in self.known_identifiers.keys():
-            return self.known_identifiers[block_identifier]['name']
+        if pool_links is None:
+            pool_links = hlp.get_pool_links(self.project_name, block['timestamp'][:10])
+        entity = pool_links.get(block_identifier)
+        if entity is not None:
+            return entity
+        identifier_info = self.known_identifiers.get(block_identifier)
+        if identifier_info is not None:
+            return identifier_info['name']
         return None
 
     def map_from_known_addresses(self, block):
@@ -40,38 +45,48 @@ class CardanoMapping(DefaultMapping):
         but it was part of the project's "special addresses" then it returns '----- SPECIAL ADDRESS -----'
 
         """
-        reward_addresses = self.get_reward_addresses(block)
-        if reward_addresses is None:  # there was no reward address associated with the block
+        # a Cardano block has at most one reward address, so there is no need to split the field (as is done in
+        # get_reward_addresses) and the address can be checked against the special addresses directly
+        reward_address = block['reward_addresses']
+        if not reward_address:  # there was no reward address associated with the block
             return 'Input Output (iohk.io)'  # pre-decentralization
-        if len(reward_addresses) == 0:  # the reward address was deemed "special" and thus removed
+        if reward_address in self.special_addresses:
             return '----- SPECIAL ADDRESS -----'
-        reward_address = reward_addresses[0]
-        if reward_address in self.known_addresses.keys():
-            return self.known_addresses[reward_address]
-        return reward_address
+        return self.known_addresses.get(reward_address, reward_address)
 
     def perform_mapping(self):
         """
         Overrides perform_mapping method of parent class to use project-specific information and extract the distribution of
-        blocks to different entities.
+        blocks to different entities. The blocks are grouped by day, so that the pool links of each day are only
+        retrieved once, and the mapped data is ordered by day.
         :returns: a list of dictionaries (mapped block data)
         """
+        blocks_per_day = defaultdict(list)
         for block in self.data_to_map:
-            entity = self.map_from_known_identifiers(block)
+            blocks_per_day[block['timestamp'][:10]].append(block)
 
-            if entity:
-                mapping_method = 'known_identifiers'
-            else:
-                entity = self.map_from_known_addresses(block)
-                mapping_method = 'known_addresses'
+        # bound methods are looked up once, as the loop below runs once per block
+        map_from_known_identifiers = self.map_from_known_identifiers
+        map_from_known_addresses = self.map_from_known_addresses
+        append_mapped_block = self.mapped_data.append
+        for day in sorted(blocks_per_day):
+            pool_links = hlp.get_pool_links(self.project_name, day)
+            for block in blocks_per_day.pop(day):
+                entity = map_from_known_identifiers(block, pool_links)
 
-            self.mapped_data.append({
-                "number": block['number'],
-                "timestamp": block['timestamp'],
-                "reward_addresses": block['reward_addresses'],
-                "creator": entity,
-                "mapping_method": mapping_method
-            })
+                if entity:
+                    mapping_method = 'known_identifiers'
+                else:
+                    entity = map_from_known_addresses(block)
+                    mapping_method = 'known_addresses'
+
+                append_mapped_block({
+                    "number": block['number'],
+                    "timestamp": block['timestamp'],
+                    "reward_addresses": block['reward_addresses'],
+                    "creator": entity,
+                    "mapping_method": mapping_method
+                })
 
         if len(self.mapped_data) > 0:
             self.write_mapped_data()
@@ -27,8 +27,9 @@ class DefaultMapping:
         self.output_dir = output_dir
         self.data_to_map = data_to_map
         self.mapped_data = list()
-        self.special_addresses = hlp.get_special_addresses(project_name)
-        self.known_addresses = hlp.get_known_addresses(project_name)
+        # copies of the cached (read-only) mapping information, as the mapping process may update them
+        self.special_addresses = set(hlp.get_special_addresses(project_name))
+        self.known_addresses = dict(hlp.get_known_addresses(project_name))
         self.known_identifiers = hlp.get_pool_identifiers(project_name)
         self.multi_pool_blocks = list()
         self.multi_pool_addresses = list()
@@ -26,6 +26,4 @@ class EthereumMapping(DefaultMapping):
         if len(reward_addresses) == 0:  # the reward address was deemed "special" and thus removed
             return '----- SPECIAL ADDRESS -----'
         reward_address = reward_addresses[0]
-        if reward_address in self.known_addresses.keys():
-            return self.known_addresses[reward_address]
-        return reward_address
+        return self.known_addresses.get(reward_address, reward_address)
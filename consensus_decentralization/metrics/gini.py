@@ -1,5 +1,8 @@
 import numpy as np
 
+# Distributions with fewer entities than this are handled in pure Python, as numpy's overhead dominates for them
+SMALL_DISTRIBUTION_SIZE = 256
+
 
 def compute_gini(blocks_per_entity):
     """
@@ -7,9 +10,17 @@ def compute_gini(blocks_per_entity):
     :param blocks_per_entity: a dictionary with entities and the blocks they have produced
     :returns: a float that represents the Gini coefficient of the given distribution or None if the data is empty
     """
-    if sum(blocks_per_entity.values()) == 0:
+    total_blocks = sum(blocks_per_entity.values())
+    if total_blocks == 0:
         return None
-    array = np.array(list(blocks_per_entity.values()))
+    if len(blocks_per_entity) < SMALL_DISTRIBUTION_SIZE:
+        n = len(blocks_per_entity)
+        cumulative_blocks, cumulative_sum = 0, 0
+        for num_blocks in sorted(blocks_per_entity.values()):
+            cumulative_blocks += num_blocks
+            cumulative_sum += cumulative_blocks
+        return ((n + 1) * total_blocks - 2 * cumulative_sum) / (n * total_blocks)
+    array = np.fromiter(blocks_per_entity.values(), dtype=np.int64, count=len(blocks_per_entity))
     return gini(array)
 
 
@@ -25,6 +36,7 @@ def gini(array):
         # Values cannot be negative:
         array -= np.amin(array)
     array = np.sort(array)
-    index = np.arange(1, array.shape[0] + 1)
     n = array.shape[0]
-    return (np.sum((2 * index - n - 1) * array)) / (n * np.sum(array))
+    total = array.sum()
+    # sum((2 * i - n - 1) * array[i - 1] for i in 1..n) is equivalent to (n + 1) * total - 2 * sum(cumsum(array))
+    return ((n + 1) * total - 2 * np.cumsum(array).sum()) / (n * total)
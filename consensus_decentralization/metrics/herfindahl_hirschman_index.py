@@ -9,7 +9,11 @@ def compute_hhi(blocks_per_entity):
     :param blocks_per_entity: a dictionary with entities and the blocks they have produced
     :return: float between 0 and 10,000 that represents the HHI of the given distribution or None if the data is empty
     """
-    total_blocks = sum(blocks_per_entity.values())
+    total_blocks, sum_of_squares = 0, 0
+    for num_blocks in blocks_per_entity.values():
+        total_blocks += num_blocks
+        sum_of_squares += num_blocks * num_blocks
     if total_blocks == 0:
         return None
-    return sum([pow(num_blocks / total_blocks * 100, 2) for num_blocks in blocks_per_entity.values()])
+    # sum((num_blocks / total_blocks * 100) ** 2) computed with integer arithmetic and a single division
+    return 10000 * sum_of_squares / (total_blocks * total_blocks)
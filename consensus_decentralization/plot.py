@@ -3,7 +3,6 @@ import logging
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import seaborn as sns
-import numpy as np
 import consensus_decentralization.helper as hlp
 import colorcet as cc
 import pandas as pd
@@ -142,10 +141,9 @@ def plot_dynamics_per_ledger(ledgers, aggregated_data_filename, top_k=-1, unit='
         if not figures_path.is_dir():
             figures_path.mkdir()
 
-        time_chunks, blocks_per_entity = hlp.get_blocks_per_entity_from_file(
+        time_chunks, entities, blocks_array = hlp.get_blocks_per_entity_matrix_from_file(
             filepath=ledger_path / "blocks_per_entity" / aggregated_data_filename
         )
-        blocks_array = np.array(list(blocks_per_entity.values()))
         total_blocks_per_time_chunk = blocks_array.sum(axis=0)
         nonzero_idx = total_blocks_per_time_chunk.nonzero()[0]  # only keep time chunks with at least one block
         total_blocks_per_time_chunk = total_blocks_per_time_chunk[nonzero_idx]
@@ -166,7 +164,7 @@ def plot_dynamics_per_ledger(ledgers, aggregated_data_filename, top_k=-1, unit='
             f"{entity_name if len(entity_name) <= 15 else entity_name[:15] + '..'}"
             f"({round(max_values_per_pool[i], 1)}{'%' if unit == 'relative' else ''})"
             if any(values[i] > legend_threshold) else f'_{entity_name}'
-            for i, entity_name in enumerate(blocks_per_entity.keys())
+            for i, entity_name in enumerate(entities)
         ]
         if top_k > 0:  # only keep the top k pools (i.e. the pools that produced the most blocks in total)
             total_value_per_pool = values.sum(axis=1)
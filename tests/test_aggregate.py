@@ -2,7 +2,7 @@ import datetime
 import json
 import shutil
 import pytest
-from consensus_decentralization.helper import OUTPUT_DIR
+from consensus_decentralization.helper import OUTPUT_DIR, iter_mapped_project_data
 from consensus_decentralization.aggregate import aggregate, Aggregator, divide_timeframe
 
 
@@ -147,6 +147,23 @@ def test_aggregate_method(setup_and_cleanup, mock_sample_bitcoin_mapped_data):
     assert sum(blocks_per_entity.values()) == 0
 
 
+def test_aggregate_chunks_method(setup_and_cleanup, mock_sample_bitcoin_mapped_data):
+    timeframe_chunks = divide_timeframe(timeframe=(datetime.date(2018, 1, 1), datetime.date(2021, 12, 31)),
+                                        granularity='month')
+    aggregator = Aggregator(project='sample_bitcoin', io_dir=setup_and_cleanup / 'sample_bitcoin',
+                            data_to_aggregate=mock_sample_bitcoin_mapped_data)
+    expected_blocks_per_entity = {}
+    for i, (chunk_start, chunk_end) in enumerate(timeframe_chunks):
+        for entity, blocks in aggregator.aggregate(chunk_start, chunk_end).items():
+            expected_blocks_per_entity.setdefault(entity, [0] * len(timeframe_chunks))[i] = blocks
+
+    # the streamed data can only be iterated over once, which is enough for aggregating all chunks
+    aggregator = Aggregator(project='sample_bitcoin', io_dir=setup_and_cleanup / 'sample_bitcoin',
+                            data_to_aggregate=iter_mapped_project_data(setup_and_cleanup / 'sample_bitcoin'))
+    blocks_per_entity = aggregator.aggregate_chunks(timeframe_chunks)
+    assert blocks_per_entity == expected_blocks_per_entity
+
+
 def test_bitcoin_aggregation(setup_and_cleanup, mock_sample_bitcoin_mapped_data):
     test_io_dir = setup_and_cleanup
 
@@ -9,7 +9,7 @@ from consensus_decentralization.parsers.dummy_parser import DummyParser
 from consensus_decentralization.map import ledger_mapping
 from consensus_decentralization.mappings.default_mapping import DefaultMapping
 from consensus_decentralization.mappings.cardano_mapping import CardanoMapping
-from consensus_decentralization.helper import OUTPUT_DIR
+from consensus_decentralization.helper import OUTPUT_DIR, clear_mapping_info_caches
 import pytest
 
 
@@ -21,6 +21,8 @@ def setup_and_cleanup():
     after (cleanup)
     """
     # Set up
+    # Clear cached mapping information, as the tests create the mapping information files of sample projects
+    clear_mapping_info_caches()
     test_output_dir = OUTPUT_DIR / "test_output"
     ledger_mapping['sample_bitcoin'] = DefaultMapping
     ledger_parser['sample_bitcoin'] = DefaultParser
@@ -1,10 +1,13 @@
 import datetime
 import argparse
+import json
+import os
 import shutil
 import pytest
 from consensus_decentralization.helper import get_pool_identifiers, get_pool_links, get_known_addresses, \
-    write_blocks_per_entity_to_file, get_blocks_per_entity_from_file, get_timeframe_beginning, get_timeframe_end, \
-    get_time_period, get_default_ledgers, valid_date, OUTPUT_DIR
+    write_blocks_per_entity_to_file, get_blocks_per_entity_from_file, get_blocks_per_entity_matrix_from_file, \
+    get_timeframe_beginning, get_timeframe_end, get_time_period, get_default_ledgers, valid_date, OUTPUT_DIR, \
+    MAPPING_INFO_DIR
 from consensus_decentralization.map import ledger_mapping
 
 
@@ -46,6 +49,37 @@ def test_pool_data():
                 pool_links['NovaBlock'] == 'Poolin', pool_links['BTC.COM'] == 'Bitdeer', ])
 
 
+def test_pool_data_is_cached():
+    assert get_pool_identifiers('test') is get_pool_identifiers('test')
+    assert get_known_addresses('test') is get_known_addresses('test')
+    assert get_pool_links('test', '2022') is get_pool_links('test', '2022')
+
+    with pytest.raises(TypeError):
+        get_pool_identifiers('test')['new identifier'] = {'name': 'New Entity'}
+    with pytest.raises(TypeError):
+        get_known_addresses('test')['new address'] = 'New Entity'
+    with pytest.raises(TypeError):
+        get_pool_links('test', '2022')['new pool'] = 'New Entity'
+    assert 'new identifier' not in get_pool_identifiers('test')
+    assert 'new address' not in get_known_addresses('test')
+
+
+def test_circular_pool_links():
+    clusters_file = MAPPING_INFO_DIR / 'clusters/test_circular.json'
+    clusters = {
+        'pool_a': [{'name': 'pool_c', 'from': '', 'to': '', 'source': ''}],
+        'pool_b': [{'name': 'pool_a', 'from': '', 'to': '', 'source': ''}],
+        'pool_c': [{'name': 'pool_b', 'from': '', 'to': '', 'source': ''}]
+    }
+    with open(clusters_file, 'w') as f:
+        json.dump(clusters, f)
+    try:
+        with pytest.raises(AssertionError):
+            get_pool_links('test_circular', '2022')
+    finally:
+        os.remove(clusters_file)
+
+
 def test_committed_pool_data():
     for project_name in ledger_mapping.keys() - ['sample_bitcoin', 'sample_ethereum', 'sample_cardano', 'sample_tezos']:
         get_pool_identifiers(project_name)
@@ -59,7 +93,7 @@ def test_committed_pool_data():
 def test_write_read_blocks_per_entity(setup_and_cleanup):
     output_dir = setup_and_cleanup
 
-    blocks_per_entity = {'Entity 1': [1, 3], 'Entity 2': [2, 2]}
+    blocks_per_entity = {'Entity 1': [1, 3], 'Entity 2': [2, 2], 'NA': [0, 1]}
 
     write_blocks_per_entity_to_file(output_dir=output_dir, blocks_per_entity=blocks_per_entity,
                                     time_chunks=['2018', '2019'], filename='test.csv')
@@ -68,7 +102,12 @@ def test_write_read_blocks_per_entity(setup_and_cleanup):
 
     assert all(len(nblocks) == len(time_chunks) for nblocks in bpe.values())
     assert time_chunks == ['2018', '2019']
-    assert all([bpe['Entity 1'] == [1, 3], bpe['Entity 2'] == [2, 2]])
+    assert all([bpe['Entity 1'] == [1, 3], bpe['Entity 2'] == [2, 2], bpe['NA'] == [0, 1]])
+
+    time_chunks, entities, blocks = get_blocks_per_entity_matrix_from_file(output_dir / 'test.csv')
+    assert time_chunks == ['2018', '2019']
+    assert entities == ['Entity 1', 'Entity 2', 'NA']
+    assert blocks.tolist() == [[1, 3], [2, 2], [0, 1]]
 
 
 def test_valid_date():
@@ -91,7 +130,9 @@ def test_get_start_date():  # currently not testing for invalid dates
 
 def test_get_timeframe_end():  # currently not testing for invalid dates
     dates = {'2022': datetime.date(2022, 12, 31), '2022-03': datetime.date(2022, 3, 31),
-             '2022-03-29': datetime.date(2022, 3, 29)}
+             '2022-03-29': datetime.date(2022, 3, 29), '2022-02': datetime.date(2022, 2, 28),
+             '2024-02': datetime.date(2024, 2, 29), '2000-02': datetime.date(2000, 2, 29),
+             '2100-02': datetime.date(2100, 2, 28)}
     for date, end_date in dates.items():
         assert get_timeframe_end(date) == end_date
 
@@ -113,3 +154,6 @@ def test_get_default_ledgers():
     ledgers = get_default_ledgers()
     assert type(ledgers) == list
     assert len(ledgers) > 0
+
+    ledgers.append('new ledger')
+    assert 'new ledger' not in get_default_ledgers()
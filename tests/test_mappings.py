@@ -12,7 +12,7 @@ from consensus_decentralization.mappings.default_mapping import DefaultMapping
 from consensus_decentralization.mappings.ethereum_mapping import EthereumMapping
 from consensus_decentralization.mappings.cardano_mapping import CardanoMapping
 from consensus_decentralization.mappings.tezos_mapping import TezosMapping
-from consensus_decentralization.helper import RAW_DATA_DIR, OUTPUT_DIR
+from consensus_decentralization.helper import RAW_DATA_DIR, OUTPUT_DIR, clear_mapping_info_caches
 
 
 @pytest.fixture
@@ -23,6 +23,8 @@ def setup_and_cleanup():
     after (cleanup)
     """
     # Set up
+    # Clear cached mapping information, as the tests create and update the mapping information files of sample projects
+    clear_mapping_info_caches()
     ledger_mapping['sample_bitcoin'] = DefaultMapping
     ledger_parser['sample_bitcoin'] = DefaultParser
     ledger_mapping['sample_ethereum'] = EthereumMapping
@@ -71,6 +71,11 @@ def test_gini():
     g6 = gini.compute_gini(blocks_per_entity={'a': 0, 'b': 0})
     assert g6 is None
 
+    # the pure python computation for small distributions must agree with the numpy one
+    blocks_per_entity = {i: (i * 7919) % 101 for i in range(1, gini.SMALL_DISTRIBUTION_SIZE)}
+    g7 = gini.compute_gini(blocks_per_entity=blocks_per_entity)
+    assert round(g7, decimals) == round(gini.gini(array=np.array(list(blocks_per_entity.values()))), decimals)
+
 
 def test_nc():
     nc1 = nakamoto_coefficient.compute_nakamoto_coefficient(blocks_per_entity={'a': 1, 'b': 2, 'c': 3})